@@ -1,20 +1,25 @@
 #!/usr/bin/env python
 # /// script
 # requires-python = ">=3.11"
-# requires = ["flask", "requests"]
+# requires = ["aiohttp", "orjson", "gunicorn"]
 # dependencies = [
-#     "flask",
-#     "requests",
+#     "aiohttp",
+#     "orjson",
+#     "gunicorn",
 # ]
 # ///
 """
-A Flask-based proxy server for the Gemini API.
+An aiohttp-based proxy server for the Gemini API.
 
 This script intercepts requests intended for the Gemini API, logs the request
 and response to a local directory, and then forwards the request to the actual
 Gemini API endpoint. It's designed to be a transparent interceptor for debugging
 and analysis purposes.
 
+The server runs on a single asyncio event loop, so upstream Gemini latency
+does not block other in-flight requests. A shared ``aiohttp.ClientSession``
+keeps upstream connections alive between requests.
+
 The server listens on the endpoints specified in the Gemini API documentation
 and mirrors the behavior of the actual API.
 
@@ -25,257 +30,505 @@ Endpoints supported:
 - POST /v1beta/models/{model}:embedContent
 
 Usage:
-    uv run proxy_interceptor.py [--port=PORT]
+    uv run proxy_interceptor.py [--port=PORT] [--workers=N]
 
-Default port is 8099.
+Default port is 8099. With --workers > 1 the proxy runs under gunicorn
+with one event loop per worker process, which is the recommended setup
+for sustained load on a multi-core machine.
 """
 
 import argparse
-import json
+import asyncio
+import hashlib
+import itertools
 import os
+import queue
+import threading
 import time
-from flask import Flask, request, Response, stream_with_context
-import requests
+
+import aiohttp
+import orjson
+from aiohttp import web
+
+from proxy_fast import (
+    feed_sse_chunk,
+    filter_request_headers,
+    filter_response_headers,
+    flush_sse_carry,
+)
 
 # --- Configuration ---
-# The base URL for the real Gemini API
+# The base URL for the real Gemini API, and the one upstream URL shape
+# built from it (query parameters are added by the client session)
 GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com"
+GEMINI_URL_FMT = GEMINI_API_BASE_URL + "/v1beta/models/{model}:{action}"
 
-# Absolute path for storing request/response logs
+# Absolute path for storing request/response logs, created once at import
+# so nothing on the request path ever has to stat it
 LOG_DIRECTORY = os.path.join(os.getcwd(), "inter_logs")
+os.makedirs(LOG_DIRECTORY, exist_ok=True)
+
+# Shared client session for all upstream calls, created when the app starts.
+SESSION: aiohttp.ClientSession | None = None
+
+# Upstream connection pool sizing and retry policy for transient 5xx errors.
+POOL_MAXSIZE = 256
+POOL_PER_HOST = 64
+UPSTREAM_RETRIES = 2
+RETRY_BACKOFF = 0.1
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Log entries are handed off to a background thread so the request path
+# never waits on disk I/O. If the queue backs up, entries are dropped
+# and counted rather than blocking the event loop.
+LOG_QUEUE: queue.Queue = queue.Queue(maxsize=10000)
+DROPPED_LOGS = 0
+
+# The worker appends entries to a rolling NDJSON file, flushing batches
+# of up to LOG_BATCH_SIZE entries or whatever arrives within
+# LOG_BATCH_WINDOW seconds, so file metadata and flush costs are
+# amortized across many requests.
+LOG_BATCH_SIZE = 100
+LOG_BATCH_WINDOW = 0.05
+
+# Response bodies above this size are streamed through without being
+# captured for logging, to bound per-request memory.
+CAPTURE_MAX_BODY = 8 << 20
+
+# Logging knobs: PROXY_LOG_SAMPLE_RATE logs only that fraction of
+# requests, and bodies larger than PROXY_LOG_MAX_BODY are replaced with
+# a size/hash stub, so heavy traffic cannot saturate the disk through
+# the proxy's own logs.
+LOG_SAMPLE_RATE = float(os.environ.get('PROXY_LOG_SAMPLE_RATE', '1.0'))
+LOG_MAX_BODY = int(os.environ.get('PROXY_LOG_MAX_BODY', str(1 << 20)))
+
+# What gets logged, via PROXY_LOG:
+#   meta    - one line of metadata per request (default)
+#   full    - verbatim request/response bodies, today's debugging format
+#   sampled - like full, but honoring PROXY_LOG_SAMPLE_RATE
+LOG_MODE = os.environ.get('PROXY_LOG', 'meta')
+FULL_LOGGING = LOG_MODE in ('full', 'sampled')
+
+# Entries are written compact (one line each) to halve log bandwidth;
+# PROXY_LOG_PRETTY=1 switches to indented output for live debugging.
+# Compact logs are best read back through `jq`.
+_DUMP_OPTS = orjson.OPT_NON_STR_KEYS
+if os.environ.get('PROXY_LOG_PRETTY') == '1':
+    _DUMP_OPTS |= orjson.OPT_INDENT_2
+
+# Counter component of log IDs, so two requests landing in the same
+# nanosecond tick (or across worker threads) can never collide.
+_COUNTER = itertools.count()
+
+
+def next_log_id():
+    """
+    Returns a unique, time-ordered ID correlating a request with its response.
+    """
+    return f"{time.time_ns()}-{next(_COUNTER)}"
+
+
+def _open_log_file(today):
+    """
+    Opens (or rolls over) the day's NDJSON log file as a raw appending fd.
+    """
+    return os.open(
+        f"{LOG_DIRECTORY}/requests-{today}.ndjson",
+        os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+        0o644
+    )
+
+
+def _sampled(entry):
+    """
+    Decides whether an entry is kept under PROXY_LOG_SAMPLE_RATE.
+
+    The decision hashes the correlation ID rather than rolling per
+    entry, so a request and its response are kept or dropped together.
+    """
+    if LOG_SAMPLE_RATE >= 1.0:
+        return True
+    return hash(entry.get("epoch_id")) % 10000 < LOG_SAMPLE_RATE * 10000
+
+
+def _parse_raw_body(entry):
+    """
+    Turns an entry's raw body bytes into a logged body, off the request path.
 
-# --- Flask App Initialization ---
-app = Flask(__name__)
+    Handlers enqueue unparsed bytes under ``_raw_body`` so the event loop
+    never pays for a JSON parse that only the log needs. Oversized bodies
+    are logged as a size-and-digest stub instead of their content.
+    """
+    raw = entry.pop("_raw_body", None)
+    if raw is None:
+        return
+    if len(raw) > LOG_MAX_BODY:
+        entry["body"] = {
+            "_truncated": True,
+            "_size": len(raw),
+            "sha256": hashlib.sha256(raw).hexdigest()
+        }
+        return
+    try:
+        entry["body"] = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        entry["body"] = raw.decode('utf-8', errors='ignore')
 
 
-def get_forwarding_headers():
+def log_worker():
     """
-    Extracts relevant headers from the incoming request to forward to the Gemini API.
+    Drains the log queue, appending batched entries to the rolling NDJSON file.
     """
-    headers = {}
-    # Forward essential headers
-    headers_to_forward = [
-        'x-goog-api-key',
-        'authorization', 
-        'content-type',
-        'x-goog-api-client',
-        'x-gemini-api-privileged-user-id',
-        'user-agent',
-        'accept',
-        'accept-language',
-        'accept-encoding'
-    ]
-    
-    for header_name in headers_to_forward:
-        # Check both lowercase and original case
-        if header_name in request.headers:
-            headers[header_name] = request.headers[header_name]
-        elif header_name.lower() in [h.lower() for h in request.headers.keys()]:
-            # Find the actual header name with correct case
-            for actual_header in request.headers.keys():
-                if actual_header.lower() == header_name.lower():
-                    headers[actual_header] = request.headers[actual_header]
-                    break
-    
-    return headers
+    log_fd = None
+    log_date = None
+    while True:
+        batch = [LOG_QUEUE.get()]
+        deadline = time.monotonic() + LOG_BATCH_WINDOW
+        while len(batch) < LOG_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(LOG_QUEUE.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        try:
+            kept = [e for e in batch if _sampled(e)]
+            if not kept:
+                continue
+            for e in kept:
+                # Handlers snapshot headers as item tuples; the copy
+                # into a dict happens here, off the request path
+                headers = e.get("headers")
+                if type(headers) is list:
+                    e["headers"] = dict(headers)
+                _parse_raw_body(e)
+            today = time.strftime('%Y%m%d')
+            if log_fd is None or log_date != today:
+                if log_fd is not None:
+                    os.close(log_fd)
+                log_fd = _open_log_file(today)
+                log_date = today
+            # OPT_NON_STR_KEYS handles multidict's istr header keys
+            iov = [orjson.dumps(e, option=_DUMP_OPTS) + b'\n' for e in kept]
+            # One vectored syscall appends the whole batch; platforms
+            # without writev fall back to a joined single write
+            if hasattr(os, 'writev'):
+                os.writev(log_fd, iov)
+            else:
+                os.write(log_fd, b''.join(iov))
+        except Exception:
+            pass
+        finally:
+            for _ in batch:
+                LOG_QUEUE.task_done()
+
+
+def enqueue_log(entry):
+    """
+    Queues a log entry for the background writer; drops it if the queue is full.
+    """
+    global DROPPED_LOGS
+    try:
+        LOG_QUEUE.put_nowait(entry)
+    except queue.Full:
+        DROPPED_LOGS += 1
 
 
 def log_request_response(
     incoming_request,
-    outgoing_response,
-    response_body,
-    epoch_time
+    raw_request_body,
+    response_status,
+    response_headers,
+    raw_response_body,
+    epoch_id
 ):
     """
-    Logs the full request and response to separate JSON files.
+    Queues the full request and response as NDJSON log entries.
+
+    Bodies are passed as raw bytes and parsed by the log worker; request
+    headers are snapshotted as item tuples and response headers reuse the
+    filtered dict the handler already built, so no extra dict copies are
+    made on the request path. Entries carry an ``epoch_id`` field so a
+    request and its response can be correlated within the day's log file.
     """
-    if not os.path.exists(LOG_DIRECTORY):
-        os.makedirs(LOG_DIRECTORY)
+    enqueue_log({
+        "epoch_id": epoch_id,
+        "kind": "request",
+        "method": incoming_request.method,
+        "url": str(incoming_request.url),
+        "headers": list(incoming_request.headers.items()),
+        "_raw_body": raw_request_body
+    })
+    enqueue_log({
+        "epoch_id": epoch_id,
+        "kind": "response",
+        "statusCode": response_status,
+        "headers": response_headers,
+        "_raw_body": raw_response_body
+    })
 
-    # Log request
-    req_log_filename = f"{epoch_time}-request.json"
-    req_log_filepath = os.path.join(LOG_DIRECTORY, req_log_filename)
-    request_log = {
+
+def log_request_meta(
+    incoming_request,
+    model,
+    action,
+    response_status,
+    upstream_ms,
+    req_bytes,
+    resp_bytes,
+    epoch_id
+):
+    """
+    Queues the single metadata entry used in the default 'meta' log mode.
+    """
+    enqueue_log({
+        "epoch_id": epoch_id,
+        "kind": "meta",
+        "ts": time.time(),
         "method": incoming_request.method,
-        "url": incoming_request.url,
-        "headers": dict(incoming_request.headers),
-        "body": incoming_request.get_json()
-    }
-    with open(req_log_filepath, 'w') as f:
-        json.dump(request_log, f, indent=2)
-
-    # Log response
-    res_log_filename = f"{epoch_time}-response.json"
-    res_log_filepath = os.path.join(LOG_DIRECTORY, res_log_filename)
-    response_log = {
-        "statusCode": outgoing_response.status_code,
-        "headers": dict(outgoing_response.headers),
-        "body": response_body
-    }
-    with open(res_log_filepath, 'w') as f:
-        json.dump(response_log, f, indent=2)
-
-
-@app.route('/v1beta/models/<path:model>:<string:action>', methods=['POST'])
-def proxy_request(model, action):
+        "model": model,
+        "action": action,
+        "status": response_status,
+        "upstream_ms": round(upstream_ms, 2),
+        "req_bytes": req_bytes,
+        "resp_bytes": resp_bytes
+    })
+
+
+async def proxy_request(request, model, action):
     """
     Handles all non-streaming requests to the Gemini API.
     """
-    # Construct the full URL for the Gemini API with all query parameters
-    gemini_url = f"{GEMINI_API_BASE_URL}/v1beta/models/{model}:{action}"
-    
-    # Forward all query parameters from the original request
-    if request.args:
-        query_params = []
-        for key, value in request.args.items():
-            query_params.append(f"{key}={value}")
-        gemini_url += "?" + "&".join(query_params)
-    
-    # Get the request body and headers
-    epoch_time = int(time.time())
-    request_body = request.get_json()
-    forward_headers = get_forwarding_headers()
-
-    # Forward the request to the Gemini API
-    response = requests.post(
-        gemini_url,
-        json=request_body,
-        headers=forward_headers
-    )
+    gemini_url = GEMINI_URL_FMT.format(model=model, action=action)
 
-    # Log the request and response
-    try:
-        response_body = response.json()
-    except json.JSONDecodeError:
-        response_body = response.text
-    log_request_response(request, response, response_body, epoch_time)
-
-    # Return the response to the client
-    # Filter out headers that could cause issues when proxying
-    filtered_headers = {}
-    seen_headers = set()
-    for key, value in response.headers.items():
-        key_lower = key.lower()
-        # Skip headers that Flask/Werkzeug should handle or that could cause conflicts
-        if key_lower not in ['content-length', 'transfer-encoding', 'connection', 'server', 'date', 'content-encoding']:
-            # Avoid duplicate headers (case-insensitive check)
-            if key_lower not in seen_headers:
-                filtered_headers[key] = value
-                seen_headers.add(key_lower)
-    
-    return Response(
-        response.content,
-        status=response.status_code,
-        headers=filtered_headers
-    )
+    # Get the raw request body and headers; the body is forwarded verbatim
+    # so it is never parsed or re-serialized on the request path
+    epoch_id = next_log_id()
+    raw_body = await request.read()
+    forward_headers = filter_request_headers(request.headers.items())
+    forward_headers.setdefault('content-type', 'application/json')
+
+    # Forward the request to the Gemini API, retrying transient upstream errors
+    started = time.monotonic()
+    for attempt in range(UPSTREAM_RETRIES + 1):
+        async with SESSION.post(
+            gemini_url,
+            params=request.query,
+            data=raw_body,
+            headers=forward_headers
+        ) as response:
+            if response.status in RETRY_STATUSES and attempt < UPSTREAM_RETRIES:
+                await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+                continue
+
+            # Filter out headers that could cause issues when proxying
+            filtered_headers = filter_response_headers(response.headers.items())
+
+            # Stream the body through without buffering it all in memory,
+            # capturing a copy for logging unless it is too large
+            client_response = web.StreamResponse(
+                status=response.status,
+                headers=filtered_headers
+            )
+            await client_response.prepare(request)
+
+            content_length = response.headers.get('Content-Length')
+            capture = FULL_LOGGING and not (
+                content_length and int(content_length) > CAPTURE_MAX_BODY
+            )
+            captured = bytearray()
+            resp_bytes = 0
+            async for chunk in response.content.iter_chunked(65536):
+                resp_bytes += len(chunk)
+                if capture:
+                    captured.extend(chunk)
+                    if len(captured) > CAPTURE_MAX_BODY:
+                        capture = False
+                        captured.clear()
+                await client_response.write(chunk)
+            await client_response.write_eof()
+
+            if FULL_LOGGING:
+                # Log the request and response; bodies are parsed by the log worker
+                log_request_response(
+                    request,
+                    raw_body,
+                    response.status,
+                    filtered_headers,
+                    bytes(captured) if capture else None,
+                    epoch_id
+                )
+            else:
+                log_request_meta(
+                    request,
+                    model,
+                    action,
+                    response.status,
+                    (time.monotonic() - started) * 1000,
+                    len(raw_body),
+                    resp_bytes,
+                    epoch_id
+                )
+            return client_response
 
-@app.route('/v1beta/models/<path:model>:streamGenerateContent', methods=['POST'])
-def proxy_streaming_request(model):
+
+async def proxy_streaming_request(request, model):
     """
     Handles streaming requests to the Gemini API.
     """
-    # Construct the full URL for the Gemini API with all query parameters
-    gemini_url = f"{GEMINI_API_BASE_URL}/v1beta/models/{model}:streamGenerateContent"
-    
-    # Forward all query parameters from the original request
-    if request.args:
-        query_params = []
-        for key, value in request.args.items():
-            query_params.append(f"{key}={value}")
-        gemini_url += "?" + "&".join(query_params)
-    
-    epoch_time = int(time.time())
-    forward_headers = get_forwarding_headers()
+    gemini_url = GEMINI_URL_FMT.format(model=model, action='streamGenerateContent')
+
+    epoch_id = next_log_id()
+    raw_body = await request.read()
+    forward_headers = filter_request_headers(request.headers.items())
+    forward_headers.setdefault('content-type', 'application/json')
 
     # Log the request immediately
-    if not os.path.exists(LOG_DIRECTORY):
-        os.makedirs(LOG_DIRECTORY)
-        
-    req_log_filename = f"{epoch_time}-request.json"
-    req_log_filepath = os.path.join(LOG_DIRECTORY, req_log_filename)
-    request_log = {
-        "method": request.method,
-        "url": request.url,
-        "headers": dict(request.headers),
-        "body": request.get_json()
-    }
-    with open(req_log_filepath, 'w') as f:
-        json.dump(request_log, f, indent=2)
-
-    # Use stream=True to handle the streaming response
-    response = requests.post(
+    if FULL_LOGGING:
+        enqueue_log({
+            "epoch_id": epoch_id,
+            "kind": "request",
+            "method": request.method,
+            "url": str(request.url),
+            "headers": list(request.headers.items()),
+            "_raw_body": raw_body
+        })
+
+    # Stream the upstream response chunk by chunk
+    started = time.monotonic()
+    async with SESSION.post(
         gemini_url,
-        json=request.get_json(),
-        headers=forward_headers,
-        stream=True
-    )
+        params=request.query,
+        data=raw_body,
+        headers=forward_headers
+    ) as upstream:
+        # Filter out problematic headers for streaming
+        filtered_headers = filter_response_headers(upstream.headers.items())
 
-    def generate():
-        """A generator function to stream the response content."""
-        full_response_text = ""
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:  # filter out keep-alive chunks
-                full_response_text += chunk.decode('utf-8', errors='ignore')
-                yield chunk
-        
-        # Log the full response after the stream is complete
-        res_log_filename = f"{epoch_time}-response.json"
-        res_log_filepath = os.path.join(LOG_DIRECTORY, res_log_filename)
-        
-        # Handle different response formats
-        body_to_log = full_response_text
-        if full_response_text.strip():
-            try:
-                # Try to parse as JSON lines (Server-Sent Events format)
-                lines = [line.strip() for line in full_response_text.strip().split('\n') if line.strip()]
-                if lines and lines[0].startswith('data: '):
-                    # Parse SSE format
-                    json_objects = []
-                    for line in lines:
-                        if line.startswith('data: '):
-                            try:
-                                json_obj = json.loads(line[6:])  # Remove 'data: ' prefix
-                                json_objects.append(json_obj)
-                            except json.JSONDecodeError:
-                                pass
-                    if json_objects:
-                        body_to_log = json_objects
-                else:
-                    # Try to parse as regular JSON
-                    try:
-                        body_to_log = json.loads(full_response_text)
-                    except json.JSONDecodeError:
-                        pass
-            except Exception:
-                # Fallback to raw text
-                pass
-
-        response_log = {
-            "statusCode": response.status_code,
-            "headers": dict(response.headers),
-            "body": body_to_log
-        }
-        with open(res_log_filepath, 'w') as f:
-            json.dump(response_log, f, indent=2)
-
-    # Filter out problematic headers for streaming
-    filtered_headers = {}
-    seen_headers = set()
-    for key, value in response.headers.items():
-        key_lower = key.lower()
-        # Skip headers that could cause streaming issues or conflicts
-        if key_lower not in ['content-length', 'transfer-encoding', 'connection', 'server', 'date', 'content-encoding']:
-            # Avoid duplicate headers (case-insensitive check)
-            if key_lower not in seen_headers:
-                filtered_headers[key] = value
-                seen_headers.add(key_lower)
-    
-    # Use stream_with_context to stream the response back to the client
-    return Response(
-        stream_with_context(generate()),
-        status=response.status_code,
-        headers=filtered_headers
+        response = web.StreamResponse(
+            status=upstream.status,
+            headers=filtered_headers
+        )
+        await response.prepare(request)
+
+        # Parse SSE 'data:' lines as they arrive so per-connection memory
+        # is bounded by one line plus the parsed objects, never the whole
+        # stream. Non-SSE bytes are kept (capped) for the fallback parse.
+        # In 'meta' mode only the byte count is tracked.
+        json_objects = []
+        leftover = bytearray()
+        carry = b''
+        resp_bytes = 0
+        async for chunk in upstream.content.iter_chunked(65536):
+            if not chunk:  # filter out keep-alive chunks
+                continue
+            await response.write(chunk)
+            resp_bytes += len(chunk)
+            if FULL_LOGGING:
+                carry = feed_sse_chunk(
+                    carry, chunk, json_objects, leftover, CAPTURE_MAX_BODY
+                )
+
+        if FULL_LOGGING:
+            # Flush any trailing partial line
+            flush_sse_carry(carry, json_objects, leftover, CAPTURE_MAX_BODY)
+
+            # Log the response after the stream is complete
+            if json_objects:
+                body_to_log = json_objects
+            else:
+                # Not SSE: try regular JSON, falling back to raw text
+                try:
+                    body_to_log = orjson.loads(bytes(leftover)) if leftover else ""
+                except orjson.JSONDecodeError:
+                    body_to_log = leftover.decode('utf-8', errors='ignore')
+
+            enqueue_log({
+                "epoch_id": epoch_id,
+                "kind": "response",
+                "statusCode": upstream.status,
+                "headers": filtered_headers,
+                "body": body_to_log
+            })
+        else:
+            log_request_meta(
+                request,
+                model,
+                'streamGenerateContent',
+                upstream.status,
+                (time.monotonic() - started) * 1000,
+                len(raw_body),
+                resp_bytes,
+                epoch_id
+            )
+
+        await response.write_eof()
+        return response
+
+
+async def proxy_dispatch(request):
+    """
+    Routes an incoming request to the streaming or non-streaming handler.
+    """
+    model = request.match_info['model']
+    action = request.match_info['action']
+    if action == 'streamGenerateContent':
+        return await proxy_streaming_request(request, model)
+    return await proxy_request(request, model, action)
+
+
+async def _client_session_ctx(app):
+    """
+    Creates the shared upstream client session for the app's lifetime.
+
+    A single session reuses warm keep-alive connections to the Gemini API
+    instead of opening a new TCP+TLS connection per request.
+    """
+    global SESSION
+    SESSION = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=POOL_MAXSIZE,
+            limit_per_host=POOL_PER_HOST,
+            keepalive_timeout=60
+        )
     )
+    yield
+    await SESSION.close()
+
+
+def create_app():
+    """
+    Builds the aiohttp application with the proxy routes.
+    """
+    threading.Thread(target=log_worker, daemon=True).start()
+    app = web.Application()
+    app.cleanup_ctx.append(_client_session_ctx)
+    app.router.add_post('/v1beta/models/{model}:{action}', proxy_dispatch)
+    return app
+
+
+def _run_gunicorn(port, workers):
+    """
+    Runs the proxy under gunicorn's aiohttp worker for multi-core serving.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class ProxyApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'0.0.0.0:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('worker_class', 'aiohttp.GunicornWebWorker')
+            self.cfg.set('keepalive', 75)
+
+        def load(self):
+            # aiohttp's worker expects an async application factory
+            async def factory():
+                return create_app()
+            return factory
+
+    ProxyApplication().run()
 
 
 if __name__ == '__main__':
@@ -288,18 +541,17 @@ if __name__ == '__main__':
         help='Port to run the server on (default: 8099)'
     )
     parser.add_argument(
-        '--no-reload',
-        dest='reload',
-        action='store_false',
-        help='Disable auto-reloading on code changes.'
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes; values > 1 run under gunicorn, '
+             '0 means 2*cpu+1 (default: 1)'
     )
-    parser.set_defaults(reload=True)
     args = parser.parse_args()
 
-    # Ensure the log directory exists
-    if not os.path.exists(LOG_DIRECTORY):
-        os.makedirs(LOG_DIRECTORY)
-        print(f"Created log directory: {LOG_DIRECTORY}")
-
-    # Run the Flask app
-    app.run(host='0.0.0.0', port=args.port, debug=args.reload)
+    # Run the aiohttp app, under gunicorn when multiple workers are wanted
+    workers = args.workers if args.workers else 2 * os.cpu_count() + 1
+    if workers > 1:
+        _run_gunicorn(args.port, workers)
+    else:
+        web.run_app(create_app(), host='0.0.0.0', port=args.port)